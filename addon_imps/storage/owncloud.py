@@ -1,28 +1,137 @@
-import xml.etree.ElementTree as ET
+import asyncio
+import functools
+import time
+import typing
+import weakref
+from http import HTTPStatus
 from urllib.parse import (
     unquote,
     urlparse,
+    urlsplit,
 )
 
+from lxml import etree
+
 from addon_toolkit.interfaces import storage
 from addon_toolkit.interfaces.storage import ItemType
 
 
-_BUILD_PROPFIND_CURRENT_USER_PRINCIPAL = """<?xml version="1.0" encoding="UTF-8"?>
+# reused across calls so libxml2 parser setup happens only once; entity
+# resolution and network access stay off since the input is untrusted
+_PROPFIND_PARSER = etree.XMLParser(
+    huge_tree=True, recover=False, resolve_entities=False, no_network=True
+)
+
+# Clark-notation tags matched during the single-pass walk of each
+# `<d:response>` subtree
+_HREF_TAG = "{DAV:}href"
+_COLLECTION_TAG = "{DAV:}collection"
+_DISPLAYNAME_TAG = "{DAV:}displayname"
+
+# compiled once at import -- `find`/`findall` re-parse their path expression
+# on every call, which adds up when a folder has thousands of entries
+# (smart_strings=False returns plain `str`s that don't pin the parsed tree)
+_NS = {"d": "DAV:"}
+_XP_IS_COLLECTION = etree.XPath(
+    "boolean(.//d:resourcetype/d:collection)", namespaces=_NS
+)
+_XP_DISPLAYNAME = etree.XPath(
+    "string(.//d:displayname)", namespaces=_NS, smart_strings=False
+)
+
+# how long a PROPFIND result may be served from cache -- short, since other
+# clients may change the remote folder out from under us
+_PROPFIND_CACHE_TTL_SECONDS: typing.Final = 30
+
+# cap on cached PROPFIND results -- expired entries are kept around for etag
+# revalidation, so without a cap the cache would grow without bound
+_PROPFIND_CACHE_MAX_ENTRIES: typing.Final = 1024
+
+# cap on PROPFINDs in flight at once (avoids socket exhaustion when a caller
+# asks about many items together)
+_MAX_CONCURRENT_PROPFINDS: typing.Final = 8
+
+
+class _TtlCache:
+    """small in-process cache with per-key locks to collapse concurrent misses"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[tuple, tuple[float, str | None, typing.Any]] = {}
+        # locks are scoped to the running event loop -- an `asyncio.Lock`
+        # awaited from a loop other than the one it was created on raises
+        # `RuntimeError` (and each `async_to_sync` call runs its own loop)
+        self._locks_by_loop: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+
+    def lock_for(self, key: tuple) -> asyncio.Lock:
+        loop_locks = self._locks_by_loop.setdefault(asyncio.get_running_loop(), {})
+        return loop_locks.setdefault(key, asyncio.Lock())
+
+    def get(self, key: tuple) -> typing.Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, _etag, value = entry
+        if time.monotonic() >= expiry:
+            return None
+        return value
+
+    def get_stale(self, key: tuple) -> tuple[str | None, typing.Any] | None:
+        """return (etag, value) even for an expired entry, for revalidation"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        _expiry, etag, value = entry
+        return (etag, value)
+
+    def set(self, key: tuple, value: typing.Any, etag: str | None = None) -> None:
+        # delete-then-insert keeps dict order as recency order, so eviction
+        # below drops the least recently written entries first
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, etag, value)
+        while len(self._entries) > self._max_entries:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: tuple) -> None:
+        del self._entries[key]
+        for loop_locks in self._locks_by_loop.values():
+            evicted_lock = loop_locks.get(key)
+            if evicted_lock is not None and not evicted_lock.locked():
+                del loop_locks[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._locks_by_loop.clear()
+
+
+_propfind_cache = _TtlCache(_PROPFIND_CACHE_TTL_SECONDS, _PROPFIND_CACHE_MAX_ENTRIES)
+
+
+def _parse_xml(response_body: bytes) -> etree._Element:
+    # parsing bytes directly skips a decode/re-encode pass over the body
+    return etree.fromstring(response_body, parser=_PROPFIND_PARSER)
+
+
+# request bodies as bytes literals so nothing re-encodes them per request
+_BUILD_PROPFIND_ACCOUNT_INFO = b"""<?xml version="1.0" encoding="UTF-8"?>
 <d:propfind xmlns:d="DAV:">
     <d:prop>
         <d:current-user-principal/>
+        <d:displayname/>
     </d:prop>
 </d:propfind>"""
 
-_BUILD_PROPFIND_DISPLAYNAME = """<?xml version="1.0" encoding="UTF-8"?>
+_BUILD_PROPFIND_DISPLAYNAME = b"""<?xml version="1.0" encoding="UTF-8"?>
 <d:propfind xmlns:d="DAV:">
     <d:prop>
         <d:displayname/>
     </d:prop>
 </d:propfind>"""
 
-_BUILD_PROPFIND_ALLPROPS = """<?xml version="1.0" encoding="UTF-8"?>
+_BUILD_PROPFIND_ALLPROPS = b"""<?xml version="1.0" encoding="UTF-8"?>
 <d:propfind xmlns:d="DAV:">
     <d:allprop/>
 </d:propfind>"""
@@ -30,66 +139,105 @@ _BUILD_PROPFIND_ALLPROPS = """<?xml version="1.0" encoding="UTF-8"?>
 
 class OwnCloudStorageImp(storage.StorageAddonHttpRequestorImp):
     async def get_external_account_id(self, auth_result_extras: dict[str, str]) -> str:
-        headers = {
-            "Depth": "0",
-        }
-        async with self.network.PROPFIND(
-            uri_path=self._strip_absolute_path(""),
-            headers=headers,
-            content=_BUILD_PROPFIND_CURRENT_USER_PRINCIPAL,
+        # ask for the principal and displayname in one round-trip -- most
+        # servers answer both, so the follow-up PROPFIND is usually skipped
+        async with self._propfind(
+            self._strip_absolute_path(""), "0", _BUILD_PROPFIND_ACCOUNT_INFO
         ) as response:
-            response_xml = await response.text_content()
-            try:
-                current_user_principal_url = self._parse_current_user_principal(
-                    response_xml
-                )
-            except ValueError:
+            root = _parse_xml(await response.binary_content())
+            principal_element = root.find(".//{DAV:}current-user-principal/{DAV:}href")
+            if principal_element is not None and principal_element.text:
+                current_user_principal_url = principal_element.text
+            else:
                 username = auth_result_extras.get("username") or self._fallback_username
                 if not username:
                     raise ValueError(
                         "Username is required for fallback but not provided."
                     )
                 current_user_principal_url = f"/remote.php/dav/files/{username}/"
+            # only trust a displayname from the combined response when it
+            # belongs to the principal resource itself -- a displayname on the
+            # root collection's response is the folder's name, not the user's
+            principal_displayname = self._find_principal_displayname(
+                root, current_user_principal_url
+            )
+            if principal_displayname:
+                return principal_displayname
 
-        current_user_principal_url = current_user_principal_url.lstrip("/")
-
-        async with self.network.PROPFIND(
-            uri_path=self._strip_absolute_path(current_user_principal_url),
-            headers=headers,
-            content=_BUILD_PROPFIND_DISPLAYNAME,
+        async with self._propfind(
+            self._strip_absolute_path(current_user_principal_url),
+            "0",
+            _BUILD_PROPFIND_DISPLAYNAME,
         ) as response:
-            response_xml = await response.text_content()
-            return self._parse_displayname(response_xml)
+            return self._parse_displayname(await response.binary_content())
 
     @property
     def _fallback_username(self) -> str | None:
         return "default-username"
 
+    def _find_principal_displayname(
+        self, root: etree._Element, principal_url: str
+    ) -> str | None:
+        principal_path = principal_url.strip("/")
+        for response_element in root.iter("{DAV:}response"):
+            href_element = response_element.find(_HREF_TAG)
+            if href_element is None or not href_element.text:
+                continue
+            if href_element.text.strip("/") != principal_path:
+                continue
+            displayname_element = response_element.find(f".//{_DISPLAYNAME_TAG}")
+            if displayname_element is not None and displayname_element.text:
+                return displayname_element.text
+        return None
+
     async def list_root_items(self, page_cursor: str = "") -> storage.ItemSampleResult:
         return await self.list_child_items(_owncloud_root_id(), page_cursor)
 
     async def get_item_info(self, item_id: str) -> storage.ItemResult:
         item_type, path = _parse_item_id(item_id)
-        url = self._strip_absolute_path(path)
+        cache_key = self._cache_key("get_item_info", path)
+        async with _propfind_cache.lock_for(cache_key):
+            cached = _propfind_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            stale = _propfind_cache.get_stale(cache_key)
+            etag = stale[0] if stale is not None else None
+
+            url = self._strip_absolute_path(path)
+            async with self._propfind(
+                url, "0", _BUILD_PROPFIND_ALLPROPS, if_none_match=etag
+            ) as response:
+                if (
+                    stale is not None
+                    and response.http_status == HTTPStatus.NOT_MODIFIED
+                ):
+                    # unchanged on the server -- reuse without re-parsing
+                    _propfind_cache.set(cache_key, stale[1], etag=etag)
+                    return stale[1]
+                root = _parse_xml(await response.binary_content())
+                response_element = root.find("{DAV:}response")
+                if response_element is None:
+                    raise ValueError("No response element found in PROPFIND response")
+                item_result = self._parse_response_element(response_element, path)
+                _propfind_cache.set(
+                    cache_key, item_result, etag=response.headers.get("ETag")
+                )
+                return item_result
 
-        headers = {
-            "Depth": "0",
-        }
+    async def get_items_info(
+        self, item_ids: list[str]
+    ) -> list[storage.ItemResult | BaseException]:
+        """fetch info for several items concurrently (one Depth:0 PROPFIND each)"""
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PROPFINDS)
 
-        async with self.network.PROPFIND(
-            uri_path=url,
-            headers=headers,
-            content=_BUILD_PROPFIND_ALLPROPS,
-        ) as response:
-            response_xml = await response.text_content()
-            root = ET.fromstring(response_xml)
-            response_element = root.find(
-                "d:response", {"d": "DAV:", "oc": "http://owncloud.org/ns"}
-            )
-            if response_element is None:
-                raise ValueError("No response element found in PROPFIND response")
-            item_result = self._parse_response_element(response_element, path)
-            return item_result
+        async def _bounded_get_item_info(item_id: str) -> storage.ItemResult:
+            async with semaphore:
+                return await self.get_item_info(item_id)
+
+        return await asyncio.gather(
+            *(_bounded_get_item_info(_item_id) for _item_id in item_ids),
+            return_exceptions=True,
+        )
 
     async def list_child_items(
         self,
@@ -98,70 +246,157 @@ class OwnCloudStorageImp(storage.StorageAddonHttpRequestorImp):
         item_type: storage.ItemType | None = None,
     ) -> storage.ItemSampleResult:
         _item_type, path = _parse_item_id(item_id)
-        relative_path = self._strip_absolute_path(path)
-        headers = {
-            "Depth": "1",
-        }
+        # item_type is part of the key because the filter is applied post-fetch
+        cache_key = self._cache_key("list_child_items", path, item_type)
+        async with _propfind_cache.lock_for(cache_key):
+            cached = _propfind_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            stale = _propfind_cache.get_stale(cache_key)
+            etag = stale[0] if stale is not None else None
+
+            relative_path = self._strip_absolute_path(path)
+            async with self._propfind(
+                relative_path, "1", _BUILD_PROPFIND_ALLPROPS, if_none_match=etag
+            ) as response:
+                if (
+                    stale is not None
+                    and response.http_status == HTTPStatus.NOT_MODIFIED
+                ):
+                    # folder unchanged -- skip the download and re-parse
+                    _propfind_cache.set(cache_key, stale[1], etag=etag)
+                    return stale[1]
+                # parse each `<d:response>` as it arrives instead of buffering
+                # the full multistatus body -- Depth:1 listings of large
+                # folders can run to many megabytes
+                pull_parser = etree.XMLPullParser(
+                    events=("end",),
+                    tag="{DAV:}response",
+                    huge_tree=True,
+                    resolve_entities=False,
+                    no_network=True,
+                )
+                items = []
+                async for chunk in response.iter_bytes():
+                    pull_parser.feed(chunk)
+                    for _event, response_element in pull_parser.read_events():
+                        item_result = self._parse_streamed_element(
+                            response_element, path, item_type
+                        )
+                        if item_result is not None:
+                            items.append(item_result)
+                        # release the processed subtree (and preceding
+                        # siblings) so memory stays bounded
+                        response_element.clear()
+                        while response_element.getprevious() is not None:
+                            del response_element.getparent()[0]
+                # close() raises XMLSyntaxError on a truncated document --
+                # without it a connection cut mid-body would quietly cache a
+                # partial listing
+                pull_parser.close()
+
+                item_sample_result = storage.ItemSampleResult(items=items)
+                _propfind_cache.set(
+                    cache_key, item_sample_result, etag=response.headers.get("ETag")
+                )
+                return item_sample_result
 
-        async with self.network.PROPFIND(
-            uri_path=relative_path,
+    def _propfind(
+        self,
+        uri_path: str,
+        depth: str,
+        content: bytes,
+        if_none_match: str | None = None,
+    ):
+        # no "br" here -- aiohttp can only decode brotli with the optional
+        # Brotli package installed, so advertising it would invite responses
+        # we can't read
+        headers = {"Depth": depth, "Accept-Encoding": "gzip, deflate"}
+        if if_none_match is not None:
+            headers["If-None-Match"] = if_none_match
+        return self.network.PROPFIND(
+            uri_path=uri_path,
             headers=headers,
-            content=_BUILD_PROPFIND_ALLPROPS,
-        ) as response:
-            response_xml = await response.text_content()
-            root = ET.fromstring(response_xml)
-            items = []
-            ns = {"d": "DAV:", "oc": "http://owncloud.org/ns"}
-            for response_element in root.findall("d:response", ns):
-                href_element = response_element.find("d:href", ns)
-                if href_element is None or not href_element.text:
-                    continue
-                href = href_element.text
-                item_path = self._href_to_path(href)
-
-                if item_path.rstrip("/") == path.rstrip("/"):
-                    continue
-
-                item_result = self._parse_response_element(response_element, item_path)
-                if item_type is not None and item_result.item_type != item_type:
-                    continue
-                items.append(item_result)
-
-            return storage.ItemSampleResult(items=items)
+            content=content,
+        )
 
-    def _strip_absolute_path(self, path: str) -> str:
-        return path.lstrip("/")
+    def _cache_key(self, *parts) -> tuple:
+        return (
+            self.config.external_account_id,
+            self.config.external_api_url,
+            *parts,
+        )
 
-    async def build_wb_config(self) -> dict:
-        base_url = self.config.external_api_url.rstrip("/")
-        parsed_url = urlparse(base_url)
+    def _parse_streamed_element(
+        self,
+        response_element: etree._Element,
+        parent_path: str,
+        item_type: storage.ItemType | None,
+    ) -> storage.ItemResult | None:
+        # one walk over the subtree collects every field at once, instead of
+        # a separate xpath evaluation per field
+        href = None
+        displayname = None
+        is_collection = False
+        for descendant in response_element.iter(
+            _HREF_TAG, _COLLECTION_TAG, _DISPLAYNAME_TAG
+        ):
+            tag = descendant.tag
+            if tag == _HREF_TAG:
+                if href is None:
+                    href = descendant.text
+            elif tag == _COLLECTION_TAG:
+                is_collection = True
+            else:
+                displayname = descendant.text
+
+        if not href:
+            return None
+        item_path = self._href_to_path(href)
+
+        if item_path.rstrip("/") == parent_path.rstrip("/"):
+            return None
+
+        parsed_item_type = (
+            storage.ItemType.FOLDER if is_collection else storage.ItemType.FILE
+        )
+        # identity comparison is enough -- enum members are singletons
+        if item_type is not None and parsed_item_type is not item_type:
+            return None
+        if not displayname:
+            displayname = item_path.rstrip("/").split("/")[-1]
+        return storage.ItemResult(
+            item_id=_make_item_id(parsed_item_type, item_path),
+            item_name=displayname,
+            item_type=parsed_item_type,
+        )
+
+    def _strip_absolute_path(self, path: str) -> str:
+        # already-relative paths (and "") pass through without a new allocation
+        return path if not path.startswith("/") else path.lstrip("/")
 
-        root_host = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        folder_path = ""
+    @functools.cached_property
+    def _root_host(self) -> str:
+        split_url = urlsplit(self.config.external_api_url)
+        return f"{split_url.scheme}://{split_url.netloc}"
 
-        wb_config = {
-            "folder": folder_path,
-            "host": root_host,
+    async def build_wb_config(self) -> dict:
+        return {
+            "folder": "",
+            "host": self._root_host,
             "verify_ssl": True,
         }
-        return wb_config
 
     def _parse_response_element(
-        self, response_element: ET.Element, path: str
+        self, response_element: etree._Element, path: str
     ) -> storage.ItemResult:
-        ns = {"d": "DAV:", "oc": "http://owncloud.org/ns"}
-        resourcetype = response_element.find(".//d:resourcetype", ns)
         item_type = (
             storage.ItemType.FOLDER
-            if resourcetype is not None
-            and resourcetype.find("d:collection", ns) is not None
+            if _XP_IS_COLLECTION(response_element)
             else storage.ItemType.FILE
         )
-        displayname_element = response_element.find(".//d:displayname", ns)
         displayname = (
-            displayname_element.text
-            if displayname_element is not None and displayname_element.text
-            else path.rstrip("/").split("/")[-1]
+            _XP_DISPLAYNAME(response_element) or path.rstrip("/").split("/")[-1]
         )
         return storage.ItemResult(
             item_id=_make_item_id(item_type, path),
@@ -169,37 +404,44 @@ class OwnCloudStorageImp(storage.StorageAddonHttpRequestorImp):
             item_type=item_type,
         )
 
-    def _parse_current_user_principal(self, response_xml: str) -> str:
-        return self._parse_property(
-            response_xml,
-            xpath=".//d:current-user-principal/d:href",
-            error_message="current-user-principal not found in response",
-        )
-
-    def _parse_displayname(self, response_xml: str) -> str:
+    def _parse_displayname(self, response_body: bytes) -> str:
         try:
             return self._parse_property(
-                response_xml,
-                xpath=".//d:displayname",
+                response_body,
+                xpath=".//{DAV:}displayname",
                 error_message="displayname not found in response",
             )
         except ValueError:
             return "default-name"
 
-    def _parse_property(self, response_xml: str, xpath: str, error_message: str) -> str:
-        ns = {"d": "DAV:"}
-        root = ET.fromstring(response_xml)
-        element = root.find(xpath, ns)
+    def _parse_property(
+        self, response_body: bytes, xpath: str, error_message: str
+    ) -> str:
+        root = _parse_xml(response_body)
+        element = root.find(xpath)
         if element is not None and element.text:
             return element.text
         else:
             raise ValueError(error_message)
 
+    @functools.cached_property
+    def _base_api_path(self) -> str:
+        # the api url never changes for a given imp instance -- parse it once
+        # instead of once per href (`urlsplit` also skips params parsing)
+        return urlsplit(self.config.external_api_url).path.strip("/")
+
     def _href_to_path(self, href: str) -> str:
-        parsed_href = urlparse(unquote(href))
-        href_path = parsed_href.path.lstrip("/")
+        # most hrefs are plain ascii paths -- only pay for percent-decoding
+        # when there's actually a percent-escape present
+        href_decoded = unquote(href) if "%" in href else href
+        # webdav servers usually send server-relative hrefs -- for those the
+        # path is the whole href, no need for a full url parse
+        if href.startswith("/") and "://" not in href[:10]:
+            href_path = href_decoded.lstrip("/")
+        else:
+            href_path = urlparse(href_decoded).path.lstrip("/")
 
-        base_path = urlparse(self.config.external_api_url).path.rstrip("/").lstrip("/")
+        base_path = self._base_api_path
         if href_path.startswith(base_path):
             # fmt: off
             path = href_path[len(base_path):]
@@ -210,15 +452,25 @@ class OwnCloudStorageImp(storage.StorageAddonHttpRequestorImp):
         return path or "/"
 
 
+# plain dict lookup is several times faster than `ItemType(value)`, which
+# goes through the Enum metaclass on every call
+_ITEM_TYPE_BY_VALUE = {_member.value: _member for _member in ItemType}
+
+
+@functools.lru_cache(maxsize=4096)
 def _make_item_id(item_type: storage.ItemType, path: str) -> str:
     return f"{item_type.value}:{path}"
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_item_id(item_id: str) -> tuple[storage.ItemType, str]:
     if not item_id:
         return ItemType.FOLDER, "/"
     _type, _path = item_id.split(":", maxsplit=1)
-    return storage.ItemType(_type), _path
+    try:
+        return _ITEM_TYPE_BY_VALUE[_type], _path
+    except KeyError:
+        raise ValueError(f"{_type!r} is not a valid {ItemType.__name__}")
 
 
 def _owncloud_root_id() -> str:
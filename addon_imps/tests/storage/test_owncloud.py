@@ -1,4 +1,5 @@
 import unittest
+from http import HTTPStatus
 from unittest.mock import (
     AsyncMock,
     sentinel,
@@ -7,6 +8,7 @@ from unittest.mock import (
 from addon_imps.storage.owncloud import (
     _BUILD_PROPFIND_ALLPROPS,
     OwnCloudStorageImp,
+    _propfind_cache,
 )
 from addon_toolkit.interfaces import storage
 from addon_toolkit.interfaces.storage import (
@@ -25,11 +27,20 @@ class TestOwnCloudStorageImp(unittest.IsolatedAsyncioTestCase):
         )
         self.network = AsyncMock(spec_set=storage.HttpRequestor)
         self.imp = OwnCloudStorageImp(config=self.config, network=self.network)
+        _propfind_cache.clear()
 
     def _patch_request(self, return_value: str):
         mock = self.network.PROPFIND.return_value.__aenter__.return_value
-        mock.text_content = AsyncMock(return_value=return_value)
+        mock.binary_content = AsyncMock(return_value=return_value.encode("utf-8"))
         mock.http_status = 200
+        # a real mapping -- a mocked `headers.get(...)` would hand back an
+        # unawaited coroutine
+        mock.headers = {"ETag": '"etag-1"'}
+
+        async def _iter_bytes():
+            yield return_value.encode("utf-8")
+
+        mock.iter_bytes = _iter_bytes
 
     def _assert_request(self, url: str, headers: dict, content: str):
         self.network.PROPFIND.assert_called_once_with(
@@ -38,27 +49,53 @@ class TestOwnCloudStorageImp(unittest.IsolatedAsyncioTestCase):
             content=content,
         )
         self.network.PROPFIND.return_value.__aenter__.assert_awaited_once_with()
-        self.network.PROPFIND.return_value.__aenter__.return_value.text_content.assert_awaited_once_with()
         self.network.PROPFIND.return_value.__aexit__.assert_awaited_once_with(
             None, None, None
         )
 
     async def test_get_external_account_id(self):
+        # the principal answers the combined PROPFIND itself, so its
+        # displayname is taken without a follow-up request
         response_xml = """<?xml version="1.0" encoding="utf-8"?>
         <d:multistatus xmlns:d="DAV:">
             <d:response>
-                <d:href>/</d:href>
+                <d:href>/users/username/</d:href>
                 <d:propstat>
                     <d:prop>
                         <d:current-user-principal>
-                            <d:href>/</d:href>
+                            <d:href>/users/username/</d:href>
                         </d:current-user-principal>
+                        <d:displayname>Test User</d:displayname>
                     </d:prop>
                     <d:status>HTTP/1.1 200 OK</d:status>
                 </d:propstat>
             </d:response>
         </d:multistatus>"""
         self._patch_request(response_xml)
+
+        result = await self.imp.get_external_account_id({})
+
+        self.assertEqual(result, "Test User")
+        self.network.PROPFIND.assert_called_once()
+
+    async def test_get_external_account_id__principal_fallback(self):
+        # the root collection's displayname must not be mistaken for the
+        # user's -- only the principal's own response may short-circuit
+        principal_xml = """<?xml version="1.0" encoding="utf-8"?>
+        <d:multistatus xmlns:d="DAV:">
+            <d:response>
+                <d:href>/</d:href>
+                <d:propstat>
+                    <d:prop>
+                        <d:current-user-principal>
+                            <d:href>/users/username/</d:href>
+                        </d:current-user-principal>
+                        <d:displayname>files</d:displayname>
+                    </d:prop>
+                    <d:status>HTTP/1.1 200 OK</d:status>
+                </d:propstat>
+            </d:response>
+        </d:multistatus>"""
         displayname_xml = """<?xml version="1.0" encoding="UTF-8"?>
         <d:multistatus xmlns:d="DAV:">
             <d:response>
@@ -66,19 +103,30 @@ class TestOwnCloudStorageImp(unittest.IsolatedAsyncioTestCase):
                 <d:propstat>
                     <d:status>HTTP/1.1 200 OK</d:status>
                     <d:prop>
-                        <d:current-user-principal>
-                            <d:href>/</d:href>
-                        </d:current-user-principal>
                         <d:displayname>Test User</d:displayname>
                     </d:prop>
                 </d:propstat>
             </d:response>
         </d:multistatus>"""
-        self._patch_request(displayname_xml)
+        mock = self.network.PROPFIND.return_value.__aenter__.return_value
+        mock.binary_content = AsyncMock(
+            side_effect=[principal_xml.encode("utf-8"), displayname_xml.encode("utf-8")]
+        )
+        mock.http_status = 200
 
         result = await self.imp.get_external_account_id({})
 
         self.assertEqual(result, "Test User")
+        self.assertEqual(self.network.PROPFIND.call_count, 2)
+
+    async def test_get_items_info(self):
+        results_by_id = {"folder:/a": sentinel.folder_a, "file:/b.txt": sentinel.file_b}
+        self.imp.get_item_info = AsyncMock(side_effect=results_by_id.__getitem__)
+
+        result = await self.imp.get_items_info(["folder:/a", "file:/b.txt"])
+
+        self.assertEqual(result, [sentinel.folder_a, sentinel.file_b])
+        self.assertEqual(self.imp.get_item_info.await_count, 2)
 
     async def test_list_root_items(self):
         mock_response = sentinel.result
@@ -113,7 +161,7 @@ class TestOwnCloudStorageImp(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, expected_result)
         self._assert_request(
             "test-folder",
-            {"Depth": "0"},
+            {"Depth": "0", "Accept-Encoding": "gzip, deflate"},
             _BUILD_PROPFIND_ALLPROPS,
         )
 
@@ -159,9 +207,29 @@ class TestOwnCloudStorageImp(unittest.IsolatedAsyncioTestCase):
         ]
         expected_result = ItemSampleResult(items=expected_items)
 
+        # a repeat call within the cache TTL is served without another PROPFIND
+        cached_result = await self.imp.list_child_items("folder:/test-folder")
+        self.assertEqual(cached_result.items, expected_result.items)
+
         self.assertEqual(result.items, expected_result.items)
         self._assert_request(
             "test-folder",
-            {"Depth": "1"},
+            {"Depth": "1", "Accept-Encoding": "gzip, deflate"},
             _BUILD_PROPFIND_ALLPROPS,
         )
+
+        # the response etag is recorded with the cache entry; once expired,
+        # the listing is revalidated with If-None-Match and reused on a 304
+        ((cache_key, (_expiry, cached_etag, cached_value)),) = (
+            _propfind_cache._entries.items()
+        )
+        self.assertEqual(cached_etag, '"etag-1"')
+        _propfind_cache._entries[cache_key] = (0.0, cached_etag, cached_value)
+        mock = self.network.PROPFIND.return_value.__aenter__.return_value
+        mock.http_status = HTTPStatus.NOT_MODIFIED
+        revalidated_result = await self.imp.list_child_items("folder:/test-folder")
+        self.assertEqual(revalidated_result.items, expected_result.items)
+        self.assertEqual(
+            self.network.PROPFIND.call_args.kwargs["headers"]["If-None-Match"],
+            '"etag-1"',
+        )
@@ -21,6 +21,9 @@ from addon_service.models import (
 
 
 RESOURCE_TYPE = get_resource_type_from_model(AuthorizedStorageAccount)
+# view names resolved once at import rather than once per field declaration
+_DETAIL_VIEW_NAME = view_names.detail_view(RESOURCE_TYPE)
+_RELATED_VIEW_NAME = view_names.related_view(RESOURCE_TYPE)
 
 
 class AuthorizedStorageAccountSerializer(AuthorizedAccountSerializer):
@@ -28,26 +31,26 @@ class AuthorizedStorageAccountSerializer(AuthorizedAccountSerializer):
         queryset=ExternalStorageService.objects.all(),
         many=False,
         source="external_service.externalstorageservice",
-        related_link_view_name=view_names.related_view(RESOURCE_TYPE),
+        related_link_view_name=_RELATED_VIEW_NAME,
     )
     configured_storage_addons = HyperlinkedRelatedField(
         many=True,
         source="configured_addons",
         queryset=ConfiguredStorageAddon.objects.active(),
-        related_link_view_name=view_names.related_view(RESOURCE_TYPE),
+        related_link_view_name=_RELATED_VIEW_NAME,
         required=False,
     )
     url = serializers.HyperlinkedIdentityField(
-        view_name=view_names.detail_view(RESOURCE_TYPE), required=False
+        view_name=_DETAIL_VIEW_NAME, required=False
     )
     account_owner = ReadOnlyResourceRelatedField(
         many=False,
         queryset=UserReference.objects.all(),
-        related_link_view_name=view_names.related_view(RESOURCE_TYPE),
+        related_link_view_name=_RELATED_VIEW_NAME,
     )
     authorized_operations = DataclassRelatedLinkField(
         dataclass_model=AddonOperationModel,
-        related_link_view_name=view_names.related_view(RESOURCE_TYPE),
+        related_link_view_name=_RELATED_VIEW_NAME,
     )
 
     included_serializers = {
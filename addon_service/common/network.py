@@ -31,6 +31,8 @@ __all__ = ("GravyvaletHttpRequestor",)
 
 _logger = logging.getLogger(__name__)
 
+_STREAM_CHUNK_SIZE = 64 * 1024  # bytes per chunk from `iter_bytes`
+
 
 class _AiohttpResponseInfo(HttpResponseInfo):
     """an imp-friendly face for an aiohttp response (without exposing aiohttp to imps)"""
@@ -60,6 +62,15 @@ class _AiohttpResponseInfo(HttpResponseInfo):
         _response = _PrivateResponse.get(self).aiohttp_response
         return await _response.text()
 
+    async def binary_content(self) -> bytes:
+        _response = _PrivateResponse.get(self).aiohttp_response
+        return await _response.read()
+
+    async def iter_bytes(self) -> typing.AsyncIterator[bytes]:
+        _response = _PrivateResponse.get(self).aiohttp_response
+        async for _chunk in _response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+            yield _chunk
+
 
 class GravyvaletHttpRequestor(HttpRequestor):
     """an `HttpRequestor` implementation using aiohttp"""
@@ -4,6 +4,7 @@ each raises `django.core.exceptions.ValidationError` for invalid values
 """
 
 import enum
+import functools
 
 from django.core.exceptions import ValidationError
 
@@ -36,10 +37,13 @@ def validate_service_type(value):
     _validate_enum_value(ServiceTypes, value)
 
 
+_EXCLUDED_CREDENTIALS_FORMATS = frozenset({CredentialsFormats.UNSPECIFIED})
+
+
 def validate_credentials_format(value):
     """validator for `CredentialsFormats` names"""
     _validate_enum_value(
-        CredentialsFormats, value, excluded_members={CredentialsFormats.UNSPECIFIED}
+        CredentialsFormats, value, excluded_members=_EXCLUDED_CREDENTIALS_FORMATS
     )
 
 
@@ -66,12 +70,25 @@ def validate_citation_imp_number(value):
 # module-private helpers
 
 
-def _validate_enum_value(enum_cls: type[enum.Enum], value, excluded_members=None):
-    try:
-        member = enum_cls(value)
-    except ValueError:
-        raise ValidationError(f'no value "{value}" in {enum_cls}')
-    if excluded_members and member in excluded_members:
+@functools.cache
+def _enum_value_map(enum_cls: type[enum.Enum]) -> dict:
+    """map each member's value to the member, dodging `Enum.__call__` overhead"""
+    return {_member.value: _member for _member in enum_cls}
+
+
+def _validate_enum_value(
+    enum_cls: type[enum.Enum], value, excluded_members: frozenset = frozenset()
+):
+    member = _enum_value_map(enum_cls).get(value)
+    if member is None:
+        # the map only knows canonical members -- composite `enum.Flag`
+        # values (e.g. `AddonCapabilities.ACCESS | UPDATE`) need the real
+        # enum constructor
+        try:
+            member = enum_cls(value)
+        except ValueError:
+            raise ValidationError(f'no value "{value}" in {enum_cls}')
+    if member in excluded_members:
         raise ValidationError(
             f'"{member.name}" is not a supported value for this field'
         )
@@ -110,10 +110,14 @@ class TestResourceReferenceModel(TestCase):
         )
 
     def test_configured_storage_addons__several(self):
+        # share one base account across the batch -- otherwise each addon
+        # drags in a fresh account/service/oauth fixture chain of its own
+        _account = _factories.AuthorizedStorageAccountFactory()
         _accounts = set(
             _factories.ConfiguredStorageAddonFactory.create_batch(
                 size=3,
                 authorized_resource=self._resource,
+                base_account=_account,
             )
         )
         self.assertEqual(
@@ -206,7 +210,6 @@ class TestResourceReferenceViewSet(TestCase):
 class TestResourceReferenceRelatedView(TestCase):
     @classmethod
     def setUpTestData(cls):
-        cls._resource = _factories.ResourceReferenceFactory()
         cls._related_view = ResourceReferenceViewSet.as_view(
             {"get": "retrieve_related"},
         )
@@ -236,9 +239,11 @@ class TestResourceReferenceRelatedView(TestCase):
         self.assertEqual(_resp.data, [])
 
     def test_get_related__several(self):
+        # reuse the existing base account rather than building four more
         _addons = _factories.ConfiguredStorageAddonFactory.create_batch(
             size=4,
             authorized_resource=self._resource,
+            base_account=self._csa.base_account,
         ) + [self._csa]
         _resp = self._related_view(
             get_test_request(
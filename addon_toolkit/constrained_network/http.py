@@ -27,8 +27,7 @@ class HttpRequestInfo:
     query: Multidict
     headers: Multidict
     json: dict
-    content: str | None = None
-    # TODO: content (when needed)
+    content: str | bytes | None = None
 
 
 class HttpResponseInfo(typing.Protocol):
@@ -42,7 +41,9 @@ class HttpResponseInfo(typing.Protocol):
 
     async def text_content(self) -> str: ...
 
-    # TODO: streaming (when needed)
+    async def binary_content(self) -> bytes: ...
+
+    def iter_bytes(self) -> typing.AsyncIterator[bytes]: ...
 
 
 class _MethodRequestMethod(typing.Protocol):
@@ -78,7 +79,7 @@ class HttpRequestor(typing.Protocol):
         query: Multidict | KeyValuePairs | None = None,
         headers: Multidict | KeyValuePairs | None = None,
         json: dict | None = None,
-        content: str | None = None,
+        content: str | bytes | None = None,
     ):
         _request_info = HttpRequestInfo(
             http_method=http_method,